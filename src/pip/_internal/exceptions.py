@@ -1,9 +1,10 @@
 """Exceptions used throughout package"""
 
+import bisect
 import configparser
+import functools
 import re
-from itertools import chain, groupby, repeat
-from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type, Union
 
 from pip._vendor.pkg_resources import Distribution
 from pip._vendor.requests.models import Request, Response
@@ -19,8 +20,25 @@ if TYPE_CHECKING:
 #
 # Scaffolding
 #
+_KEBAB_RE = re.compile(r"^[a-z]+(?:-[a-z]+)*\Z")
+
+
+@functools.lru_cache(maxsize=64)
 def _is_kebab_case(s: str) -> bool:
-    return re.match(r"^[a-z]+(-[a-z]+)*$", s) is not None
+    return _KEBAB_RE.match(s) is not None
+
+
+_FAVORITE_HASH: Optional[str] = None
+
+
+def _get_favorite_hash() -> str:
+    global _FAVORITE_HASH
+    if _FAVORITE_HASH is None:
+        # Dodge circular import.
+        from pip._internal.utils.hashes import FAVORITE_HASH
+
+        _FAVORITE_HASH = FAVORITE_HASH
+    return _FAVORITE_HASH
 
 
 def _prefix_with_indent(prefix: str, s: str, indent: Optional[str] = None) -> str:
@@ -28,6 +46,8 @@ def _prefix_with_indent(prefix: str, s: str, indent: Optional[str] = None) -> st
         indent = " " * len(prefix)
     else:
         assert len(indent) == len(prefix)
+    if "\n" not in s:
+        return f"{prefix}{s}\n"
     message = s.replace("\n", "\n" + indent)
     return f"{prefix}{message}\n"
 
@@ -47,6 +67,15 @@ class DiagnosticPipError(PipError):
 
     reference: str
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+
+        # Validate class-level references once, when the class is created,
+        # rather than every time an instance is constructed.
+        reference = cls.__dict__.get("reference")
+        if reference is not None:
+            assert _is_kebab_case(reference), "error reference must be kebab-case!"
+
     def __init__(
         self,
         *,
@@ -62,7 +91,8 @@ class DiagnosticPipError(PipError):
         if reference is None:
             assert hasattr(self, "reference"), "error reference not provided!"
             reference = self.reference
-        assert _is_kebab_case(reference), "error reference must be kebab-case!"
+        else:
+            assert _is_kebab_case(reference), "error reference must be kebab-case!"
 
         super().__init__(f"{reference}: {message}")
 
@@ -75,23 +105,22 @@ class DiagnosticPipError(PipError):
         self.hint_stmt = hint_stmt
 
     def __str__(self) -> str:
-        return "".join(self._string_parts())
-
-    def _string_parts(self) -> Iterator[str]:
         # Present the main message, with relevant context indented.
-        yield f"{self.message}\n"
+        parts = [self.message, "\n"]
         if self.context is not None:
-            yield f"\n{self.context}\n"
+            parts.extend(("\n", self.context, "\n"))
 
         # Space out the note/hint messages.
         if self.attention_stmt is not None or self.hint_stmt is not None:
-            yield "\n"
+            parts.append("\n")
 
         if self.attention_stmt is not None:
-            yield _prefix_with_indent("Note: ", self.attention_stmt)
+            parts.append(_prefix_with_indent("Note: ", self.attention_stmt))
 
         if self.hint_stmt is not None:
-            yield _prefix_with_indent("Hint: ", self.hint_stmt)
+            parts.append(_prefix_with_indent("Hint: ", self.hint_stmt))
+
+        return "".join(parts)
 
 
 #
@@ -173,10 +202,7 @@ class NoneMetadataError(PipError):
     def __str__(self) -> str:
         # Use `dist` in the error message because its stringification
         # includes more information, like the version and location.
-        return "None {} metadata found for distribution: {}".format(
-            self.metadata_name,
-            self.dist,
-        )
+        return f"None {self.metadata_name} metadata found for distribution: {self.dist}"
 
 
 class UserInstallationInvalid(InstallationError):
@@ -188,8 +214,9 @@ class UserInstallationInvalid(InstallationError):
 
 class InvalidSchemeCombination(InstallationError):
     def __str__(self) -> str:
-        before = ", ".join(str(a) for a in self.args[:-1])
-        return f"Cannot set {before} and {self.args[-1]} together"
+        *before, last = self.args
+        before_str = ", ".join([str(a) for a in before])
+        return f"Cannot set {before_str} and {last} together"
 
 
 class DistributionNotFound(InstallationError):
@@ -230,12 +257,9 @@ class NetworkConnectionError(PipError):
         self.response = response
         self.request = request
         self.error_msg = error_msg
-        if (
-            self.response is not None
-            and not self.request
-            and hasattr(response, "request")
-        ):
-            self.request = self.response.request
+        # A Response always has a `request` attribute, which may be None.
+        if response is not None and request is None:
+            self.request = response.request
         super().__init__(error_msg, response, request)
 
     def __str__(self) -> str:
@@ -267,11 +291,10 @@ class MetadataInconsistent(InstallationError):
         self.m_val = m_val
 
     def __str__(self) -> str:
-        template = (
-            "Requested {} has inconsistent {}: "
-            "filename has {!r}, but metadata has {!r}"
+        return (
+            f"Requested {self.ireq} has inconsistent {self.field}: "
+            f"filename has {self.f_val!r}, but metadata has {self.m_val!r}"
         )
-        return template.format(self.ireq, self.field, self.f_val, self.m_val)
 
 
 class InstallationSubprocessError(InstallationError):
@@ -283,26 +306,33 @@ class InstallationSubprocessError(InstallationError):
 
     def __str__(self) -> str:
         return (
-            "Command errored out with exit status {}: {} "
+            f"Command errored out with exit status {self.returncode}: "
+            f"{self.description} "
             "Check the logs for full command output."
-        ).format(self.returncode, self.description)
+        )
 
 
 class HashErrors(InstallationError):
     """Multiple HashError instances rolled into one for reporting"""
 
     def __init__(self) -> None:
+        # Kept sorted by ``order``; ``_orders`` mirrors it for bisection.
         self.errors: List["HashError"] = []
+        self._orders: List[int] = []
 
     def append(self, error: "HashError") -> None:
-        self.errors.append(error)
+        index = bisect.bisect_right(self._orders, error.order)
+        self._orders.insert(index, error.order)
+        self.errors.insert(index, error)
 
     def __str__(self) -> str:
         lines = []
-        self.errors.sort(key=lambda e: e.order)
-        for cls, errors_of_cls in groupby(self.errors, lambda e: e.__class__):
-            lines.append(cls.head)
-            lines.extend(e.body() for e in errors_of_cls)
+        prev_cls: Optional[Type["HashError"]] = None
+        for error in self.errors:
+            if error.__class__ is not prev_cls:
+                prev_cls = error.__class__
+                lines.append(prev_cls.head)
+            lines.append(error.body())
         if lines:
             return "\n".join(lines)
         return ""
@@ -401,9 +431,6 @@ class HashMissing(HashError):
         self.gotten_hash = gotten_hash
 
     def body(self) -> str:
-        # Dodge circular import.
-        from pip._internal.utils.hashes import FAVORITE_HASH
-
         package = None
         if self.req:
             # In the case of URL-based requirements, display the original URL
@@ -416,8 +443,9 @@ class HashMissing(HashError):
                 # to InstallRequirement's constructor.
                 else getattr(self.req, "req", None)
             )
-        return "    {} --hash={}:{}".format(
-            package or "unknown package", FAVORITE_HASH, self.gotten_hash
+        return (
+            f"    {package or 'unknown package'} "
+            f"--hash={_get_favorite_hash()}:{self.gotten_hash}"
         )
 
 
@@ -461,7 +489,7 @@ class HashMismatch(HashError):
         self.gots = gots
 
     def body(self) -> str:
-        return "    {}:\n{}".format(self._requirement_name(), self._hash_comparison())
+        return f"    {self._requirement_name()}:\n{self._hash_comparison()}"
 
     def _hash_comparison(self) -> str:
         """
@@ -475,19 +503,16 @@ class HashMismatch(HashError):
 
         """
 
-        def hash_then_or(hash_name: str) -> "chain[str]":
-            # For now, all the decent hashes have 6-char names, so we can get
-            # away with hard-coding space literals.
-            return chain([hash_name], repeat("    or"))
-
         lines: List[str] = []
         for hash_name, expecteds in self.allowed.items():
-            prefix = hash_then_or(hash_name)
-            lines.extend(
-                ("        Expected {} {}".format(next(prefix), e)) for e in expecteds
-            )
+            # For now, all the decent hashes have 6-char names, so we can get
+            # away with hard-coding space literals.
+            prefix = hash_name
+            for e in expecteds:
+                lines.append(f"        Expected {prefix} {e}")
+                prefix = "    or"
             lines.append(
-                "             Got        {}\n".format(self.gots[hash_name].hexdigest())
+                f"             Got        {self.gots[hash_name].hexdigest()}\n"
             )
         return "\n".join(lines)
 
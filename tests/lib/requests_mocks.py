@@ -24,7 +24,7 @@ class FakeStream:
 
 
 class MockResponse:
-    request: "MockRequest"
+    request: Optional["MockRequest"]
     connection: "MockConnection"
     url: str
 
@@ -36,6 +36,7 @@ class MockResponse:
         self.headers = {"Content-Length": str(len(contents))}
         self.history: List[MockResponse] = []
         self.from_cache = False
+        self.request = None
 
 
 class MockConnection:
@@ -48,11 +48,17 @@ class TestDiagnosticPipErrorCreation:
         ],
     )
     def test_rejects_non_kebab_case_names(self, name: str) -> None:
-        class DerivedError(DiagnosticPipError):
-            reference = name
+        with pytest.raises(AssertionError) as exc_info:
+
+            class DerivedError(DiagnosticPipError):
+                reference = name
 
+        assert str(exc_info.value) == "error reference must be kebab-case!"
+
+    @pytest.mark.parametrize("name", ["BadName", "bad_name", "bad-name-"])
+    def test_rejects_non_kebab_case_names_from_arguments(self, name: str) -> None:
         with pytest.raises(AssertionError) as exc_info:
-            DerivedError(message="", context=None, hint_stmt=None)
+            DiagnosticPipError(message="", context=None, hint_stmt=None, reference=name)
 
         assert str(exc_info.value) == "error reference must be kebab-case!"
 